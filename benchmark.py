@@ -0,0 +1,28 @@
+import time
+
+from bot import detect_script, transliterate_text
+
+PHRASES = [
+    "Салом, бугун ҳаво жуда яхши.",
+    "Ўзбекистон Республикаси пойтахти Тошкент шаҳри.",
+    "Men bugun g'alaba qozondim va o'zimni yaxshi his qilyapman.",
+    "Shahar markazida yangi choyxona ochildi.",
+]
+ROUNDS = 20000
+
+def run(label, make_text):
+    transliterate_text.cache_clear()
+    start = time.perf_counter()
+    for i in range(ROUNDS):
+        text = make_text(i)
+        transliterate_text(text, to_latin=detect_script(text) == 'cyrillic')
+    elapsed = time.perf_counter() - start
+    print(f"{label}: {ROUNDS / elapsed:,.0f} phrases/s ({elapsed * 1e6 / ROUNDS:.1f} us/phrase)")
+
+def main():
+    run("cold", lambda i: f"{PHRASES[i % len(PHRASES)]} {i}")
+    run("cached", lambda i: PHRASES[i % len(PHRASES)])
+    print(transliterate_text.cache_info())
+
+if __name__ == "__main__":
+    main()
@@ -1,26 +1,246 @@
 import os
+import sys
 import logging
 import tempfile
 import io
 import requests
 import re
-from telegram import Update, InlineKeyboardButton, InlineKeyboardMarkup, ReplyKeyboardMarkup, BotCommand
-from telegram.ext import Application, CommandHandler, MessageHandler, CallbackQueryHandler, ContextTypes, filters
+import zipfile
+import zlib
+import asyncio
+import cProfile
+import pstats
+import threading
+import time
+import traceback
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from contextvars import ContextVar
+from functools import lru_cache, wraps
+from telegram import Update, InlineKeyboardButton, InlineKeyboardMarkup, ReplyKeyboardMarkup, BotCommand, InlineQueryResultArticle, InputTextMessageContent
+from telegram.ext import Application, CommandHandler, MessageHandler, CallbackQueryHandler, InlineQueryHandler, ContextTypes, filters
 from dotenv import load_dotenv
-from PIL import Image
+from PIL import Image, ImageOps
 from pdf2docx import Converter
 from docx import Document
+from docx.enum.text import WD_ALIGN_PARAGRAPH
+from docx.table import Table
+from docx.text.paragraph import Paragraph
+from fontTools import subset as font_subset
+from fontTools.ttLib import TTFont
 from PyPDF2 import PdfReader, PdfWriter
 
 load_dotenv()
 BOT_TOKEN = os.getenv("BOT_TOKEN")
 CLOUD_CONVERT_API_KEY = os.getenv("CLOUD_CONVERT_API_KEY", "")
 ADMIN_ID = os.getenv("ADMIN_ID", "145414784")
+TEXT_CACHE_SIZE = int(os.getenv("TEXT_CACHE_SIZE", "1024"))
+TELEGRAM_MESSAGE_LIMIT = 4096
+IMAGE_PDF_DPI = int(os.getenv("IMAGE_PDF_DPI", "150"))
+IMAGE_PDF_WORKERS = int(os.getenv("IMAGE_PDF_WORKERS", str(min(4, os.cpu_count() or 1))))
+IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.webp', '.bmp', '.tif', '.tiff')
+IMAGE_PDF_MAX_FILES = 300
+IMAGE_MAX_FILE_SIZE = 25 * 1024 * 1024
+LOOP_LAG_THRESHOLD = float(os.getenv("LOOP_LAG_THRESHOLD", "1.0"))
+PROFILE_DEFAULT_JOBS = 10
+PDF_FONT_PATH = os.getenv("PDF_FONT_PATH", "")
+PDF_FONT_CANDIDATES = (
+    '/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf',
+    '/usr/share/fonts/dejavu/DejaVuSans.ttf',
+    '/usr/share/fonts/TTF/DejaVuSans.ttf',
+    '/usr/share/fonts/truetype/liberation/LiberationSans-Regular.ttf',
+    '/usr/share/fonts/truetype/noto/NotoSans-Regular.ttf',
+    'C:\\Windows\\Fonts\\arial.ttf',
+)
+PDF_BUNDLED_FONT = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fonts', 'DejaVuSans.ttf')
+PDF_PAGE_WIDTH = 595.28
+PDF_PAGE_HEIGHT = 841.89
+PDF_MARGIN = 56.7
+PDF_FONT_SIZE = 11
+PDF_TABLE_FONT_SIZE = 10
+PDF_LINE_SPACING = 1.35
 
 logging.basicConfig(
     format="%(asctime)s - %(name)s - %(levelname)s - %(message)s", level=logging.INFO
 )
 logger = logging.getLogger(__name__)
+logging.getLogger('fontTools').setLevel(logging.ERROR)
+
+profiling = {
+    'profiler': None,
+    'bot': None,
+    'chat_id': None,
+    'jobs_left': None,
+    'started_at': None,
+    'timer_task': None,
+    'thread_profiles': None,
+}
+function_timings = {}
+job_depth = ContextVar('job_depth', default=0)
+background_tasks = set()
+loop_lag_stop = threading.Event()
+
+def create_background_task(coro):
+    # The loop only keeps weak references to tasks, so hold one until it ends.
+    task = asyncio.get_running_loop().create_task(coro)
+    background_tasks.add(task)
+    task.add_done_callback(background_tasks.discard)
+    return task
+
+def timed(func):
+    # Only the outermost timed call counts as a job, so converters that call
+    # other converters (e.g. transliterate_pdf -> convert_word_to_pdf_cloud)
+    # are not counted twice towards /profile N.
+    @wraps(func)
+    async def wrapper(*args, **kwargs):
+        depth = job_depth.get()
+        token = job_depth.set(depth + 1)
+        start = time.perf_counter()
+        try:
+            return await func(*args, **kwargs)
+        finally:
+            elapsed = time.perf_counter() - start
+            job_depth.reset(token)
+            stats = function_timings.setdefault(func.__name__, [0, 0.0, 0.0])
+            stats[0] += 1
+            stats[1] += elapsed
+            stats[2] = max(stats[2], elapsed)
+            logger.info(f"{func.__name__} took {elapsed:.3f}s")
+            
+            if depth == 0 and profiling['jobs_left'] is not None:
+                profiling['jobs_left'] -= 1
+                if profiling['jobs_left'] <= 0:
+                    profiling['profiler'].disable()
+                    create_background_task(finish_profiling())
+    return wrapper
+
+def start_profiling(bot, chat_id, jobs=None, seconds=None):
+    function_timings.clear()
+    profiling['bot'] = bot
+    profiling['chat_id'] = chat_id
+    profiling['jobs_left'] = jobs
+    profiling['started_at'] = time.time()
+    profiling['thread_profiles'] = []
+    profiling['profiler'] = cProfile.Profile()
+    profiling['profiler'].enable()
+    
+    if seconds:
+        profiling['timer_task'] = asyncio.get_running_loop().create_task(stop_profiling_after(seconds))
+
+def profiled_call(func, *args):
+    # cProfile only sees the thread it was enabled in, so work handed to
+    # worker threads gets its own profiler whose stats are merged at the end.
+    thread_profiles = profiling['thread_profiles']
+    if thread_profiles is None:
+        return func(*args)
+    
+    profiler = cProfile.Profile()
+    try:
+        profiler.enable()
+    except ValueError:
+        # Python 3.12+ allows only one active cProfile per process.
+        return func(*args)
+    try:
+        return func(*args)
+    finally:
+        profiler.disable()
+        thread_profiles.append(profiler)
+
+async def stop_profiling_after(seconds):
+    await asyncio.sleep(seconds)
+    profiling['timer_task'] = None
+    await finish_profiling()
+
+def format_function_timings():
+    lines = [f"{'function':<28}{'calls':>7}{'total s':>10}{'avg s':>9}{'max s':>9}"]
+    for name, (calls, total, longest) in sorted(function_timings.items(), key=lambda item: -item[1][1]):
+        lines.append(f"{name:<28}{calls:>7}{total:>10.3f}{total / calls:>9.3f}{longest:>9.3f}")
+    return "\n".join(lines)
+
+async def finish_profiling():
+    profiler = profiling['profiler']
+    if profiler is None:
+        return
+    
+    profiler.disable()
+    if profiling['timer_task'] is not None:
+        profiling['timer_task'].cancel()
+    
+    duration = time.time() - profiling['started_at']
+    bot = profiling['bot']
+    chat_id = profiling['chat_id']
+    thread_profiles = profiling['thread_profiles']
+    for key in profiling:
+        profiling[key] = None
+    
+    with tempfile.NamedTemporaryFile(suffix='.prof', delete=False) as temp_prof:
+        prof_path = temp_prof.name
+    
+    try:
+        report = io.StringIO()
+        stats = pstats.Stats(profiler, stream=report)
+        for thread_profile in list(thread_profiles):
+            stats.add(thread_profile)
+        stats.dump_stats(prof_path)
+        
+        report.write(f"Profil davomiyligi: {duration:.1f}s\n")
+        report.write(f"Qo'shilgan ishchi oqimlar profillari: {len(thread_profiles)}\n\n")
+        report.write(format_function_timings())
+        report.write("\n\n")
+        stats.sort_stats('cumulative').print_stats(40)
+        
+        with open(prof_path, 'rb') as f:
+            prof_bytes = f.read()
+        
+        await bot.send_document(
+            chat_id=chat_id,
+            document=io.BytesIO(prof_bytes),
+            filename="profile.prof",
+            caption="cProfile natijasi (snakeviz yoki pstats bilan oching)"
+        )
+        await bot.send_document(
+            chat_id=chat_id,
+            document=io.BytesIO(report.getvalue().encode('utf-8')),
+            filename="profile.txt"
+        )
+    except Exception as e:
+        logger.error(f"Error sending profile: {str(e)}")
+    finally:
+        if os.path.exists(prof_path):
+            os.unlink(prof_path)
+
+async def monitor_loop_lag(threshold=LOOP_LAG_THRESHOLD):
+    # A heartbeat on the loop plus a watchdog thread: the watchdog notices a
+    # missed heartbeat while the loop is still blocked and logs the stack of
+    # whatever is running, the heartbeat logs the total lag once it resumes.
+    interval = threshold / 2
+    loop_thread_id = threading.get_ident()
+    heartbeat = {'due': time.monotonic() + interval, 'reported': False}
+    
+    loop_lag_stop.clear()
+    
+    def watchdog():
+        while not loop_lag_stop.wait(interval):
+            # Measured from when the heartbeat should have woken, so the
+            # heartbeat's own sleep is not counted as blocking time.
+            stalled = time.monotonic() - heartbeat['due']
+            if stalled > threshold and not heartbeat['reported']:
+                heartbeat['reported'] = True
+                frame = sys._current_frames().get(loop_thread_id)
+                stack = "".join(traceback.format_stack(frame)) if frame else ""
+                logger.warning(f"Event loop blocked for {stalled:.2f}s, currently running:\n{stack}")
+    
+    threading.Thread(target=watchdog, name="loop-lag-watchdog", daemon=True).start()
+    
+    while True:
+        before = time.monotonic()
+        await asyncio.sleep(interval)
+        now = time.monotonic()
+        lag = now - before - interval
+        if lag > threshold:
+            logger.warning(f"Event loop lag: callback blocked the loop for {lag:.2f}s")
+        heartbeat['due'] = now + interval
+        heartbeat['reported'] = False
 
 def get_main_keyboard():
     keyboard = [
@@ -36,6 +256,14 @@ def get_convert_keyboard():
             InlineKeyboardButton("PDF → Word", callback_data="pdf_to_word"),
             InlineKeyboardButton("Word → PDF", callback_data="word_to_pdf")
         ],
+        [InlineKeyboardButton("Rasmlar → PDF", callback_data="images_to_pdf")],
+        [InlineKeyboardButton("⬅️ Orqaga", callback_data="back_to_main")]
+    ]
+    return InlineKeyboardMarkup(keyboard)
+
+def get_images_done_keyboard():
+    keyboard = [
+        [InlineKeyboardButton("✅ PDF yaratish", callback_data="images_to_pdf_done")],
         [InlineKeyboardButton("⬅️ Orqaga", callback_data="back_to_main")]
     ]
     return InlineKeyboardMarkup(keyboard)
@@ -56,7 +284,8 @@ async def start(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     if not context.user_data.get('notified_admin'):
         user_info = f"Yangi foydalanuvchi botni ishga tushirdi!\n\n"
         user_info += f"ID: {user.id}\n"
-        user_info += f"Username: @{user.username if user.username else 'username yo\'q'}\n"
+        username = user.username if user.username else "username yo'q"
+        user_info += f"Username: @{username}\n"
         user_info += f"Ism: {user.first_name} {user.last_name if user.last_name else ''}"
         
         try:
@@ -78,7 +307,9 @@ async def help_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> No
         "1. PDF fayllarni Word hujjatlariga o'zgartirish\n"
         "2. Word hujjatlarini PDF fayllariga o'zgartirish\n"
         "3. PDF yoki Word fayllardan belgilangan betlarni ajratib olish\n"
-        "4. Fayllarni Kril va Lotin alifbosida almashtirish\n\n"
+        "4. Fayllarni Kril va Lotin alifbosida almashtirish\n"
+        "5. Rasmlarni (albom yoki ZIP) bitta PDF faylga jamlash\n"
+        "6. Matnni Kril va Lotin alifbosida almashtirish (matnni yuboring yoki @bot orqali inline rejimda yozing)\n\n"
         "Quyidagi menyudan variantni tanlang:",
         reply_markup=get_main_keyboard()
     )
@@ -110,11 +341,36 @@ async def handle_text(update: Update, context: ContextTypes.DEFAULT_TYPE) -> Non
         )
     elif context.user_data.get('waiting_for_pages'):
         await handle_page_input(update, context)
+    elif context.user_data.get('waiting_for_file'):
+        await update.message.reply_text(
+            "Iltimos, faylni yuklang yoki \"⬅️ Orqaga\" tugmasi orqali bekor qiling."
+        )
     else:
+        script = detect_script(text)
+        if script:
+            await reply_transliterated_text(update, transliterate_text(text, to_latin=script == 'cyrillic'))
+        else:
+            await update.message.reply_text(
+                "Iltimos, menyudan variantni tanlang:",
+                reply_markup=get_main_keyboard()
+            )
+
+async def reply_transliterated_text(update: Update, result) -> None:
+    if not result.strip():
         await update.message.reply_text(
-            "Iltimos, menyudan variantni tanlang:",
+            "Almashtirishdan so'ng matn bo'sh qoldi.",
             reply_markup=get_main_keyboard()
         )
+        return
+    
+    # Digraphs (sh, ch, yo, ...) can make the result longer than Telegram's
+    # 4096-character message limit, so long results go out in several parts.
+    chunks = [result[i:i + TELEGRAM_MESSAGE_LIMIT] for i in range(0, len(result), TELEGRAM_MESSAGE_LIMIT)]
+    for index, chunk in enumerate(chunks):
+        await update.message.reply_text(
+            chunk,
+            reply_markup=get_main_keyboard() if index == len(chunks) - 1 else None
+        )
 
 async def handle_page_input(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     page_input = update.message.text
@@ -196,6 +452,7 @@ def parse_page_ranges(page_input):
     
     return sorted(set(pages))
 
+@timed
 async def extract_pdf_pages(pdf_path, pages_to_extract):
     output_path = pdf_path.replace('.pdf', '_selected_pages.pdf')
     
@@ -227,6 +484,7 @@ async def extract_pdf_pages(pdf_path, pages_to_extract):
         if os.path.exists(output_path):
             os.unlink(output_path)
 
+@timed
 async def extract_docx_pages(docx_path, pages_to_extract):
     pdf_path = docx_path.replace('.docx', '_temp.pdf')
     output_pdf_path = docx_path.replace('.docx', '_selected_pages.pdf')
@@ -242,16 +500,7 @@ async def extract_docx_pages(docx_path, pages_to_extract):
             with open(pdf_path, 'wb') as pdf_file:
                 pdf_file.write(pdf_bytes.getbuffer())
         else:
-            from fpdf import FPDF
-            pdf = FPDF()
-            
-            for para in doc.paragraphs:
-                pdf.add_page()
-                pdf.set_font("Arial", size=12)
-                text = para.text.encode('latin-1', 'replace').decode('latin-1')
-                pdf.multi_cell(0, 10, text)
-            
-            pdf.output(pdf_path)
+            render_docx_to_pdf(doc, pdf_path)
         
         pdf_reader = PdfReader(pdf_path)
         pdf_writer = PdfWriter()
@@ -285,69 +534,83 @@ async def extract_docx_pages(docx_path, pages_to_extract):
             if os.path.exists(path):
                 os.unlink(path)
 
+CYRILLIC_TO_LATIN_MAP = {
+    'а': 'a', 'б': 'b', 'в': 'v', 'г': 'g', 'д': 'd', 'е': 'e', 'ё': 'yo',
+    'ж': 'j', 'з': 'z', 'и': 'i', 'й': 'y', 'к': 'k', 'л': 'l', 'м': 'm',
+    'н': 'n', 'о': 'o', 'п': 'p', 'р': 'r', 'с': 's', 'т': 't', 'у': 'u',
+    'ф': 'f', 'х': 'x', 'ц': 's', 'ч': 'ch', 'ш': 'sh', 'щ': 'sh', 'ъ': '\'',
+    'ы': 'i', 'ь': '', 'э': 'e', 'ю': 'yu', 'я': 'ya', 'ў': 'o\'', 'қ': 'q',
+    'ғ': 'g\'', 'ҳ': 'h',
+    'А': 'A', 'Б': 'B', 'В': 'V', 'Г': 'G', 'Д': 'D', 'Е': 'E', 'Ё': 'Yo',
+    'Ж': 'J', 'З': 'Z', 'И': 'I', 'Й': 'Y', 'К': 'K', 'Л': 'L', 'М': 'M',
+    'Н': 'N', 'О': 'O', 'П': 'P', 'Р': 'R', 'С': 'S', 'Т': 'T', 'У': 'U',
+    'Ф': 'F', 'Х': 'X', 'Ц': 'S', 'Ч': 'Ch', 'Ш': 'Sh', 'Щ': 'Sh', 'Ъ': '\'',
+    'Ы': 'I', 'Ь': '', 'Э': 'E', 'Ю': 'Yu', 'Я': 'Ya', 'Ў': 'O\'', 'Қ': 'Q',
+    'Ғ': 'G\'', 'Ҳ': 'H'
+}
+
+LATIN_TO_CYRILLIC_DIGRAPHS = [
+    (re.compile(r"O['ʻ‘’]"), "Ў"),
+    (re.compile(r"o['ʻ‘’]"), "ў"),
+    (re.compile(r"G['ʻ‘’]"), "Ғ"),
+    (re.compile(r"g['ʻ‘’]"), "ғ"),
+    (re.compile(r"Ch"), "Ч"),
+    (re.compile(r"ch"), "ч"),
+    (re.compile(r"Sh"), "Ш"),
+    (re.compile(r"sh"), "ш"),
+    (re.compile(r"Yu"), "Ю"),
+    (re.compile(r"yu"), "ю"),
+    (re.compile(r"Ya"), "Я"),
+    (re.compile(r"ya"), "я"),
+    (re.compile(r"Yo"), "Ё"),
+    (re.compile(r"yo"), "ё"),
+    (re.compile(r"Ts"), "Ц"),
+    (re.compile(r"ts"), "ц"),
+]
+
+LATIN_TO_CYRILLIC_MAP = {
+    'a': 'а', 'b': 'б', 'v': 'в', 'g': 'г', 'd': 'д', 'e': 'е',
+    'j': 'ж', 'z': 'з', 'i': 'и', 'y': 'й', 'k': 'к', 'l': 'л', 'm': 'м',
+    'n': 'н', 'o': 'о', 'p': 'п', 'r': 'р', 's': 'с', 't': 'т', 'u': 'у',
+    'f': 'ф', 'x': 'х', 'h': 'ҳ', 'q': 'қ',
+    'A': 'А', 'B': 'Б', 'V': 'В', 'G': 'Г', 'D': 'Д', 'E': 'Е',
+    'J': 'Ж', 'Z': 'З', 'I': 'И', 'Y': 'Й', 'K': 'К', 'L': 'Л', 'M': 'М',
+    'N': 'Н', 'O': 'О', 'P': 'П', 'R': 'Р', 'S': 'С', 'T': 'Т', 'U': 'У',
+    'F': 'Ф', 'X': 'Х', 'H': 'Ҳ', 'Q': 'Қ'
+}
+
+CYRILLIC_TO_LATIN_TABLE = str.maketrans(CYRILLIC_TO_LATIN_MAP)
+LATIN_TO_CYRILLIC_TABLE = str.maketrans(LATIN_TO_CYRILLIC_MAP)
+
 def cyrillic_to_latin(text):
-    cyrillic_to_latin_map = {
-        'а': 'a', 'б': 'b', 'в': 'v', 'г': 'g', 'д': 'd', 'е': 'e', 'ё': 'yo',
-        'ж': 'j', 'з': 'z', 'и': 'i', 'й': 'y', 'к': 'k', 'л': 'l', 'м': 'm',
-        'н': 'n', 'о': 'o', 'п': 'p', 'р': 'r', 'с': 's', 'т': 't', 'у': 'u',
-        'ф': 'f', 'х': 'x', 'ц': 'ts', 'ч': 'ch', 'ш': 'sh', 'щ': 'sh', 'ъ': ''',
-        'ы': 'i', 'ь': '', 'э': 'e', 'ю': 'yu', 'я': 'ya', 'ў': 'o'', 'қ': 'q',
-        'ғ': 'g'', 'ҳ': 'h',
-        'А': 'A', 'Б': 'B', 'В': 'V', 'Г': 'G', 'Д': 'D', 'Е': 'E', 'Ё': 'Yo',
-        'Ж': 'J', 'З': 'Z', 'И': 'I', 'Й': 'Y', 'К': 'K', 'Л': 'L', 'М': 'M',
-        'Н': 'N', 'О': 'O', 'П': 'P', 'Р': 'R', 'С': 'S', 'Т': 'T', 'У': 'U',
-        'Ф': 'F', 'Х': 'X', 'Ц': 'Ts', 'Ч': 'Ch', 'Ш': 'Sh', 'Щ': 'Sh', 'Ъ': ''',
-        'Ы': 'I', 'Ь': '', 'Э': 'E', 'Ю': 'Yu', 'Я': 'Ya', 'Ў': 'O\'', 'Қ': 'Q',
-        'Ғ': 'G\'', 'Ҳ': 'H'
-    }
-    
-    text = text.replace('Ц', 'S')
-    text = text.replace('ц', 's')
-    
-    result = ""
-    for char in text:
-        result += cyrillic_to_latin_map.get(char, char)
-    
-    return result
+    return text.translate(CYRILLIC_TO_LATIN_TABLE)
 
 def latin_to_cyrillic(text):
-    text = re.sub(r"O['']", "Ў", text)
-    text = re.sub(r"o['']", "ў", text)
-    text = re.sub(r"G['']", "Ғ", text)
-    text = re.sub(r"g['']", "ғ", text)
-    text = re.sub(r"Ch", "Ч", text)
-    text = re.sub(r"ch", "ч", text)
-    text = re.sub(r"Sh", "Ш", text)
-    text = re.sub(r"sh", "ш", text)
-    text = re.sub(r"Yu", "Ю", text)
-    text = re.sub(r"yu", "ю", text)
-    text = re.sub(r"Ya", "Я", text)
-    text = re.sub(r"ya", "я", text)
-    text = re.sub(r"Yo", "Ё", text)
-    text = re.sub(r"yo", "ё", text)
-    text = re.sub(r"Ts", "Ц", text)
-    text = re.sub(r"ts", "ц", text)
-    
-    latin_to_cyrillic_map = {
-        'a': 'а', 'b': 'б', 'v': 'в', 'g': 'г', 'd': 'д', 'e': 'е',
-        'j': 'ж', 'z': 'з', 'i': 'и', 'y': 'й', 'k': 'к', 'l': 'л', 'm': 'м',
-        'n': 'н', 'o': 'о', 'p': 'п', 'r': 'р', 's': 'с', 't': 'т', 'u': 'у',
-        'f': 'ф', 'x': 'х', 'h': 'ҳ', 'q': 'қ',
-        'A': 'А', 'B': 'Б', 'V': 'В', 'G': 'Г', 'D': 'Д', 'E': 'Е',
-        'J': 'Ж', 'Z': 'З', 'I': 'И', 'Y': 'Й', 'K': 'К', 'L': 'Л', 'M': 'М',
-        'N': 'Н', 'O': 'О', 'P': 'П', 'R': 'Р', 'S': 'С', 'T': 'Т', 'U': 'У',
-        'F': 'Ф', 'X': 'Х', 'H': 'Ҳ', 'Q': 'Қ'
-    }
+    for pattern, replacement in LATIN_TO_CYRILLIC_DIGRAPHS:
+        text = pattern.sub(replacement, text)
     
-    result = ""
-    i = 0
-    while i < len(text):
-        char = text[i]
-        result += latin_to_cyrillic_map.get(char, char)
-        i += 1
+    return text.translate(LATIN_TO_CYRILLIC_TABLE)
+
+def detect_script(text):
+    cyrillic = 0
+    latin = 0
+    for char in text:
+        if char in CYRILLIC_TO_LATIN_MAP:
+            cyrillic += 1
+        elif char in LATIN_TO_CYRILLIC_MAP:
+            latin += 1
     
-    return result
+    if not cyrillic and not latin:
+        return None
+    return 'cyrillic' if cyrillic >= latin else 'latin'
+
+@lru_cache(maxsize=TEXT_CACHE_SIZE)
+def transliterate_text(text, to_latin=True):
+    if to_latin:
+        return cyrillic_to_latin(text)
+    return latin_to_cyrillic(text)
 
+@timed
 async def transliterate_docx(file_bytes, file_name, to_latin=True):
     with tempfile.NamedTemporaryFile(suffix='.docx', delete=False) as temp_docx:
         temp_docx.write(file_bytes)
@@ -390,6 +653,7 @@ async def transliterate_docx(file_bytes, file_name, to_latin=True):
         if os.path.exists(output_path):
             os.unlink(output_path)
 
+@timed
 async def transliterate_pdf(file_bytes, file_name, to_latin=True):
     with tempfile.NamedTemporaryFile(suffix='.pdf', delete=False) as temp_pdf:
         temp_pdf.write(file_bytes)
@@ -437,16 +701,7 @@ async def transliterate_pdf(file_bytes, file_name, to_latin=True):
                 
                 return io.BytesIO(output_bytes)
             else:
-                from fpdf import FPDF
-                pdf = FPDF()
-                
-                for para in doc.paragraphs:
-                    pdf.add_page()
-                    pdf.set_font("Arial", size=12)
-                    text = para.text.encode('latin-1', 'replace').decode('latin-1')
-                    pdf.multi_cell(0, 10, text)
-                
-                pdf.output(output_pdf_path)
+                render_docx_to_pdf(doc, output_pdf_path)
                 
                 with open(output_pdf_path, 'rb') as file:
                     output_bytes = file.read()
@@ -500,6 +755,24 @@ async def handle_document(update: Update, context: ContextTypes.DEFAULT_TYPE) ->
         )
         return
     
+    if file_type == 'images_to_pdf':
+        if file_name.lower().endswith(IMAGE_EXTENSIONS):
+            await queue_image(update, context, file.file_id)
+            return
+        if not file_name.lower().endswith('.zip'):
+            await update.message.reply_text(
+                "Iltimos, rasmlarni yoki rasmlar joylangan ZIP faylni yuklang.",
+                reply_markup=get_convert_keyboard()
+            )
+            return
+        queued_count = len(context.user_data.get('image_file_ids') or [])
+        if queued_count:
+            context.user_data['image_file_ids'] = []
+            await update.message.reply_text(
+                f"Oldin yuborilgan {queued_count} ta rasm hisobga olinmaydi: "
+                f"PDF faqat ZIP fayl ichidagi rasmlardan yaratiladi."
+            )
+    
     await update.message.reply_text("Faylingiz qayta ishlanmoqda, iltimos kuting...")
     
     try:
@@ -571,6 +844,25 @@ async def handle_document(update: Update, context: ContextTypes.DEFAULT_TYPE) ->
                 caption="Mana sizning Kirilcha faylingiz!"
             )
             context.user_data['waiting_for_file'] = None
+            
+        elif file_type == 'images_to_pdf':
+            with tempfile.NamedTemporaryFile(suffix='.pdf', delete=False) as temp_pdf:
+                pdf_path = temp_pdf.name
+            
+            try:
+                await convert_zip_to_pdf(file_bytes, pdf_path)
+                output_name = os.path.splitext(file_name)[0] + '.pdf'
+                with open(pdf_path, 'rb') as pdf_file:
+                    await update.message.reply_document(
+                        document=pdf_file,
+                        filename=output_name,
+                        caption="Mana sizning PDF faylingiz!"
+                    )
+            finally:
+                if os.path.exists(pdf_path):
+                    os.unlink(pdf_path)
+            context.user_data['waiting_for_file'] = None
+            context.user_data['image_file_ids'] = []
         
         await update.message.reply_text(
             "O'zgartirish tugallandi! Yana nima qilmoqchisiz?",
@@ -584,6 +876,93 @@ async def handle_document(update: Update, context: ContextTypes.DEFAULT_TYPE) ->
         )
         context.user_data['waiting_for_file'] = None
 
+async def queue_image(update: Update, context: ContextTypes.DEFAULT_TYPE, file_id) -> None:
+    image_file_ids = context.user_data.setdefault('image_file_ids', [])
+    if len(image_file_ids) >= IMAGE_PDF_MAX_FILES:
+        if not context.user_data.get('image_limit_notified'):
+            context.user_data['image_limit_notified'] = True
+            await update.message.reply_text(
+                f"Eng ko'pi bilan {IMAGE_PDF_MAX_FILES} ta rasm qabul qilinadi. "
+                f"Qolgan rasmlar hisobga olinmadi, PDF yaratish tugmasini bosing.",
+                reply_markup=get_images_done_keyboard()
+            )
+        return
+    image_file_ids.append(file_id)
+    
+    # A media group arrives as one update per photo; answer only once per group.
+    media_group_id = update.message.media_group_id
+    if media_group_id and media_group_id == context.user_data.get('last_media_group_id'):
+        return
+    context.user_data['last_media_group_id'] = media_group_id
+    
+    await update.message.reply_text(
+        "Rasm qabul qilindi. Yana rasm yuboring yoki PDF yaratish tugmasini bosing.",
+        reply_markup=get_images_done_keyboard()
+    )
+
+async def handle_photo(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+    if context.user_data.get('waiting_for_file') != 'images_to_pdf':
+        await update.message.reply_text(
+            "Rasmlarni PDF ga aylantirish uchun menyudan \"Rasmlar → PDF\" ni tanlang.",
+            reply_markup=get_main_keyboard()
+        )
+        return
+    
+    await queue_image(update, context, update.message.photo[-1].file_id)
+
+async def handle_images_done(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+    query = update.callback_query
+    # Take the queue before the first await so a second press of the button
+    # finds it empty instead of converting the same photos again.
+    image_file_ids = list(context.user_data.get('image_file_ids') or [])
+    context.user_data['image_file_ids'] = []
+    
+    if not image_file_ids:
+        await query.message.reply_text("Iltimos, avval kamida bitta rasm yuboring.")
+        return
+    
+    await query.message.reply_text(
+        f"{len(image_file_ids)} ta rasm PDF ga aylantirilmoqda, iltimos kuting..."
+    )
+    
+    try:
+        # Photos are spooled to disk and the workers open them by path, so
+        # only the pages currently being decoded are held in memory.
+        with tempfile.TemporaryDirectory() as temp_dir:
+            image_sources = []
+            for index, file_id in enumerate(image_file_ids):
+                new_file = await context.bot.get_file(file_id)
+                image_path = os.path.join(temp_dir, f"{index:04d}")
+                await new_file.download_to_drive(image_path)
+                image_sources.append(image_path)
+            
+            pdf_path = os.path.join(temp_dir, "images.pdf")
+            await convert_images_to_pdf(image_sources, pdf_path)
+            
+            with open(pdf_path, 'rb') as pdf_file:
+                await query.message.reply_document(
+                    document=pdf_file,
+                    filename="images.pdf",
+                    caption="Mana sizning PDF faylingiz!"
+                )
+        
+        await query.message.reply_text(
+            "O'zgartirish tugallandi! Yana nima qilmoqchisiz?",
+            reply_markup=get_main_keyboard()
+        )
+    except Exception as e:
+        logger.error(f"Error processing images: {str(e)}")
+        await query.message.reply_text(
+            f"Kechirasiz, rasmlarni qayta ishlashda xatolik yuz berdi: {str(e)}",
+            reply_markup=get_main_keyboard()
+        )
+    finally:
+        context.user_data['waiting_for_file'] = None
+        context.user_data['image_file_ids'] = []
+        context.user_data['last_media_group_id'] = None
+        context.user_data['image_limit_notified'] = False
+
+@timed
 async def convert_pdf_to_word(file_bytes, file_name):
     with tempfile.NamedTemporaryFile(suffix='.pdf', delete=False) as temp_pdf:
         temp_pdf.write(file_bytes)
@@ -609,6 +988,7 @@ async def convert_pdf_to_word(file_bytes, file_name):
         if os.path.exists(docx_path):
             os.unlink(docx_path)
 
+@timed
 async def convert_word_to_pdf_cloud(file_bytes, file_name):
     if not CLOUD_CONVERT_API_KEY:
         raise Exception(
@@ -687,6 +1067,440 @@ async def convert_word_to_pdf_cloud(file_bytes, file_name):
         logger.error(f"Error converting Word to PDF with cloud service: {str(e)}")
         raise
 
+def prepare_pdf_page(image_source, dpi=IMAGE_PDF_DPI):
+    # A4 at the target DPI; draft() lets the JPEG decoder skip straight to a
+    # reduced scale instead of decoding the full-resolution photo.
+    long_side = int(11.69 * dpi)
+    short_side = int(8.27 * dpi)
+    
+    # image_source is either a path to a downloaded image or raw bytes.
+    if not isinstance(image_source, str):
+        image_source = io.BytesIO(image_source)
+    
+    with Image.open(image_source) as img:
+        img.draft('RGB', (short_side, short_side))
+        img = ImageOps.exif_transpose(img)
+        if img.mode != 'RGB':
+            img = img.convert('RGB')
+        
+        if img.width > img.height:
+            img.thumbnail((long_side, short_side), Image.LANCZOS)
+        else:
+            img.thumbnail((short_side, long_side), Image.LANCZOS)
+        
+        output = io.BytesIO()
+        img.save(output, format='JPEG', quality=85, optimize=True)
+        return output.getvalue(), img.width, img.height
+
+def iter_zip_images(zip_path):
+    with zipfile.ZipFile(zip_path) as archive:
+        members = sorted(
+            (info for info in archive.infolist()
+             if info.filename.lower().endswith(IMAGE_EXTENSIONS) and not info.filename.startswith('__MACOSX/')),
+            key=lambda info: [int(part) if part.isdigit() else part.lower() for part in re.split(r'(\d+)', info.filename)]
+        )
+        
+        # Check the declared sizes before decompressing anything so a ZIP bomb
+        # is rejected up front instead of being inflated into memory.
+        if len(members) > IMAGE_PDF_MAX_FILES:
+            raise Exception(f"ZIP faylda rasmlar juda ko'p. Eng ko'pi bilan {IMAGE_PDF_MAX_FILES} ta rasm bo'lishi mumkin.")
+        for info in members:
+            if info.file_size > IMAGE_MAX_FILE_SIZE:
+                raise Exception(f"{info.filename} rasmi juda katta. Har bir rasm {IMAGE_MAX_FILE_SIZE // (1024 * 1024)} MB dan oshmasligi kerak.")
+        
+        for info in members:
+            with archive.open(info) as member:
+                image_bytes = member.read(IMAGE_MAX_FILE_SIZE + 1)
+            if len(image_bytes) > IMAGE_MAX_FILE_SIZE:
+                raise Exception(f"{info.filename} rasmi juda katta. Har bir rasm {IMAGE_MAX_FILE_SIZE // (1024 * 1024)} MB dan oshmasligi kerak.")
+            yield image_bytes
+
+def write_pdf_object(output, offsets, obj_id, body, stream=None):
+    offsets[obj_id] = output.tell()
+    output.write(f"{obj_id} 0 obj\n".encode('ascii'))
+    output.write(body.encode('ascii'))
+    if stream is not None:
+        output.write(b"\nstream\n")
+        output.write(stream)
+        output.write(b"\nendstream")
+    output.write(b"\nendobj\n")
+
+def write_pdf_trailer(output, offsets, page_ids):
+    # Object 1 is always the catalog and object 2 the page tree; pages refer
+    # to "2 0 R" before it is written, which is why both go out last.
+    kids = " ".join(f"{page_id} 0 R" for page_id in page_ids)
+    write_pdf_object(output, offsets, 2, f"<< /Type /Pages /Kids [{kids}] /Count {len(page_ids)} >>")
+    write_pdf_object(output, offsets, 1, "<< /Type /Catalog /Pages 2 0 R >>")
+    
+    xref_offset = output.tell()
+    size = max(offsets) + 1
+    output.write(f"xref\n0 {size}\n0000000000 65535 f \n".encode('ascii'))
+    for obj_id in range(1, size):
+        output.write(f"{offsets[obj_id]:010d} 00000 n \n".encode('ascii'))
+    output.write(f"trailer\n<< /Size {size} /Root 1 0 R >>\nstartxref\n{xref_offset}\n%%EOF\n".encode('ascii'))
+
+def images_to_pdf(image_sources, output_path, dpi=IMAGE_PDF_DPI, workers=IMAGE_PDF_WORKERS):
+    offsets = {}
+    page_ids = []
+    
+    with open(output_path, 'wb') as output:
+        def write_page(page):
+            jpeg_bytes, width, height = page
+            page_width = width * 72 / dpi
+            page_height = height * 72 / dpi
+            image_id = 3 + len(page_ids) * 3
+            
+            write_pdf_object(
+                output, offsets, image_id,
+                f"<< /Type /XObject /Subtype /Image /Width {width} /Height {height} "
+                f"/ColorSpace /DeviceRGB /BitsPerComponent 8 /Filter /DCTDecode /Length {len(jpeg_bytes)} >>",
+                jpeg_bytes
+            )
+            content = f"q {page_width:.2f} 0 0 {page_height:.2f} 0 0 cm /Im0 Do Q".encode('ascii')
+            write_pdf_object(output, offsets, image_id + 1, f"<< /Length {len(content)} >>", content)
+            write_pdf_object(
+                output, offsets, image_id + 2,
+                f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 {page_width:.2f} {page_height:.2f}] "
+                f"/Resources << /XObject << /Im0 {image_id} 0 R >> >> /Contents {image_id + 1} 0 R >>"
+            )
+            page_ids.append(image_id + 2)
+        
+        output.write(b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n")
+        
+        # Only a small window of pages is in flight at once, so memory stays
+        # bounded by a few decoded images no matter how many pages there are.
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            pending = deque()
+            for image_bytes in image_sources:
+                pending.append(executor.submit(profiled_call, prepare_pdf_page, image_bytes, dpi))
+                if len(pending) >= workers * 2:
+                    write_page(pending.popleft().result())
+            while pending:
+                write_page(pending.popleft().result())
+        
+        if not page_ids:
+            raise Exception("Hech qanday rasm topilmadi.")
+        
+        write_pdf_trailer(output, offsets, page_ids)
+    
+    return len(page_ids)
+
+@timed
+async def convert_images_to_pdf(image_sources, pdf_path):
+    # The whole build (including reading ZIP members) runs in a worker thread;
+    # waiting on the decode pool from the loop thread would stall every update.
+    try:
+        page_count = await asyncio.to_thread(profiled_call, images_to_pdf, image_sources, pdf_path)
+        logger.info(f"Built PDF from {page_count} images")
+    except Exception as e:
+        logger.error(f"Error converting images to PDF: {str(e)}")
+        raise
+
+async def convert_zip_to_pdf(file_bytes, pdf_path):
+    with tempfile.NamedTemporaryFile(suffix='.zip', delete=False) as temp_zip:
+        temp_zip.write(file_bytes)
+        zip_path = temp_zip.name
+    
+    try:
+        await convert_images_to_pdf(iter_zip_images(zip_path), pdf_path)
+    finally:
+        if os.path.exists(zip_path):
+            os.unlink(zip_path)
+
+def find_pdf_font():
+    for path in (PDF_FONT_PATH,) + PDF_FONT_CANDIDATES + (PDF_BUNDLED_FONT,):
+        if path and os.path.exists(path):
+            return path
+    raise Exception(
+        "PDF yaratish uchun Unicode shrift topilmadi. Iltimos, .env fayliga PDF_FONT_PATH "
+        "(masalan, DejaVuSans.ttf) qo'shing yoki CLOUD_CONVERT_API_KEY ni sozlang."
+    )
+
+@lru_cache(maxsize=4)
+def load_pdf_font(path):
+    # Parsed once per process: the glyph map and advance widths are all the
+    # layout needs, so later jobs never touch the TTF tables again.
+    font = TTFont(path)
+    units = font['head'].unitsPerEm
+    scale = 1000 / units
+    glyph_order = font.getGlyphOrder()
+    hmtx = font['hmtx']
+    os2 = font['OS/2'] if 'OS/2' in font else None
+    
+    cmap = {codepoint: font.getGlyphID(name) for codepoint, name in font.getBestCmap().items()}
+    widths = [round(hmtx[name][0] * scale) for name in glyph_order]
+    char_widths = {chr(codepoint): widths[gid] for codepoint, gid in cmap.items()}
+    char_codes = {chr(codepoint): f"{gid:04X}" for codepoint, gid in cmap.items()}
+    
+    base_chars = (
+        list(range(0x20, 0x7f)) + list(range(0xa0, 0x180)) + list(range(0x400, 0x4b4))
+        + [ord(char) for char in "ʻʼ‘’“”«»–—…№•"]
+    )
+    base_gids = frozenset([0] + [cmap[codepoint] for codepoint in base_chars if codepoint in cmap])
+    
+    name = font['name'].getDebugName(6) or os.path.splitext(os.path.basename(path))[0]
+    name = re.sub(r'[^A-Za-z0-9-]', '', name) or 'Font'
+    head = font['head']
+    
+    return {
+        'path': path,
+        'name': name,
+        'cmap': cmap,
+        'widths': widths,
+        'char_widths': char_widths,
+        'char_codes': char_codes,
+        'base_gids': base_gids,
+        'ascent': round(font['hhea'].ascent * scale),
+        'descent': round(font['hhea'].descent * scale),
+        'cap_height': round(getattr(os2, 'sCapHeight', 0) * scale) if os2 else 700,
+        'bbox': [round(value * scale) for value in (head.xMin, head.yMin, head.xMax, head.yMax)],
+    }
+
+@lru_cache(maxsize=16)
+def subset_pdf_font(path, gids):
+    # Every job's glyphs are padded up to the same Latin + Cyrillic base set in
+    # render_docx_to_pdf, so ordinary Uzbek documents all hit the same entry.
+    font = TTFont(path)
+    options = font_subset.Options()
+    options.retain_gids = True
+    options.notdef_outline = True
+    options.hinting = False
+    options.layout_features = []
+    options.name_IDs = []
+    subsetter = font_subset.Subsetter(options)
+    subsetter.populate(gids=sorted(gids))
+    subsetter.subset(font)
+    
+    output = io.BytesIO()
+    font.save(output)
+    font_bytes = output.getvalue()
+    return zlib.compress(font_bytes), len(font_bytes)
+
+def iter_docx_blocks(doc):
+    for child in doc.element.body.iterchildren():
+        if child.tag.endswith('}p'):
+            yield Paragraph(child, doc)
+        elif child.tag.endswith('}tbl'):
+            yield Table(child, doc)
+
+def render_docx_to_pdf(doc, output_path, font_path=None):
+    font = load_pdf_font(font_path or find_pdf_font())
+    cmap = font['cmap']
+    widths = font['widths']
+    char_widths = font['char_widths']
+    char_codes = font['char_codes']
+    missing_width = widths[0]
+    used_chars = set()
+    style_sizes = {}
+    
+    content_width = PDF_PAGE_WIDTH - 2 * PDF_MARGIN
+    top = PDF_PAGE_HEIGHT - PDF_MARGIN
+    
+    offsets = {}
+    page_ids = []
+    ops = []
+    y = top
+    
+    def text_width(text, size):
+        return sum(char_widths.get(char, missing_width) for char in text) * size / 1000
+    
+    def wrap_text(text, size, max_width):
+        # Widths are kept in font units and summed incrementally so each word
+        # is measured once rather than re-measuring the whole line.
+        limit = max_width * 1000 / size
+        space = char_widths.get(' ', missing_width)
+        lines = []
+        for raw_line in text.replace('\t', '    ').split('\n'):
+            line = []
+            line_width = 0
+            for word in raw_line.split(' '):
+                word_width = sum(char_widths.get(char, missing_width) for char in word)
+                extra = word_width + (space if line else 0)
+                if line_width + extra <= limit:
+                    line_width += extra
+                    line.append(word)
+                    continue
+                if line:
+                    lines.append(" ".join(line))
+                line = []
+                line_width = 0
+                if word_width <= limit:
+                    line = [word]
+                    line_width = word_width
+                    continue
+                chunk = ""
+                chunk_width = 0
+                for char in word:
+                    char_width = char_widths.get(char, missing_width)
+                    if chunk and chunk_width + char_width > limit:
+                        lines.append(chunk)
+                        chunk = ""
+                        chunk_width = 0
+                    chunk += char
+                    chunk_width += char_width
+                line = [chunk]
+                line_width = chunk_width
+            lines.append(" ".join(line))
+        return lines
+    
+    def encode_text(text):
+        used_chars.update(text)
+        return "".join([char_codes.get(char, "0000") for char in text])
+    
+    def draw_text(x, baseline, text, size):
+        if text:
+            ops.append(f"BT /F1 {size} Tf {x:.2f} {baseline:.2f} Td <{encode_text(text)}> Tj ET")
+    
+    with open(output_path, 'wb') as output:
+        def flush_page():
+            nonlocal y
+            content = zlib.compress("\n".join(ops).encode('ascii'))
+            content_id = 8 + len(page_ids) * 2
+            write_pdf_object(output, offsets, content_id, f"<< /Length {len(content)} /Filter /FlateDecode >>", content)
+            write_pdf_object(
+                output, offsets, content_id + 1,
+                f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 {PDF_PAGE_WIDTH} {PDF_PAGE_HEIGHT}] "
+                f"/Resources << /Font << /F1 3 0 R >> >> /Contents {content_id} 0 R >>"
+            )
+            page_ids.append(content_id + 1)
+            ops.clear()
+            y = top
+        
+        def ensure_space(height):
+            if y - height < PDF_MARGIN and ops:
+                flush_page()
+        
+        def baseline_in(line_top, size, leading):
+            return line_top - (leading - size) / 2 - size * font['ascent'] / (font['ascent'] - font['descent'])
+        
+        output.write(b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n")
+        
+        for block in iter_docx_blocks(doc):
+            if isinstance(block, Paragraph):
+                # Resolving block.style walks every style in the document, so
+                # look each style id up once per job.
+                style_id = block._p.style
+                if style_id not in style_sizes:
+                    style_name = block.style.name if block.style is not None else ''
+                    if style_name == 'Title':
+                        style_sizes[style_id] = PDF_FONT_SIZE * 2
+                    elif style_name.startswith('Heading'):
+                        style_sizes[style_id] = PDF_FONT_SIZE * 1.5
+                    else:
+                        style_sizes[style_id] = PDF_FONT_SIZE
+                size = style_sizes[style_id]
+                leading = size * PDF_LINE_SPACING
+                
+                for line in wrap_text(block.text, size, content_width):
+                    ensure_space(leading)
+                    x = PDF_MARGIN
+                    if block.alignment in (WD_ALIGN_PARAGRAPH.CENTER, WD_ALIGN_PARAGRAPH.RIGHT):
+                        free = content_width - text_width(line, size)
+                        x += free / 2 if block.alignment == WD_ALIGN_PARAGRAPH.CENTER else free
+                    draw_text(x, baseline_in(y, size, leading), line, size)
+                    y -= leading
+                y -= size * 0.5
+            
+            else:
+                size = PDF_TABLE_FONT_SIZE
+                leading = size * PDF_LINE_SPACING
+                padding = 4
+                for row in block.rows:
+                    cells = row.cells
+                    if not cells:
+                        continue
+                    cell_width = content_width / len(cells)
+                    cell_lines = [wrap_text(cell.text, size, cell_width - 2 * padding) for cell in cells]
+                    row_lines = max(len(lines) for lines in cell_lines)
+                    full_height = row_lines * leading + 2 * padding
+                    if full_height <= top - PDF_MARGIN:
+                        ensure_space(full_height)
+                    
+                    # A row taller than a whole page is drawn in slices,
+                    # continuing the same cells on the following pages.
+                    start = 0
+                    while True:
+                        fit = int((y - PDF_MARGIN - 2 * padding) // leading)
+                        if fit < 1 and ops:
+                            flush_page()
+                            fit = int((y - PDF_MARGIN - 2 * padding) // leading)
+                        fit = max(1, fit)
+                        end = min(row_lines, start + fit)
+                        row_height = (end - start) * leading + 2 * padding
+                        
+                        for index, lines in enumerate(cell_lines):
+                            x = PDF_MARGIN + index * cell_width
+                            ops.append(f"{x:.2f} {y - row_height:.2f} {cell_width:.2f} {row_height:.2f} re S")
+                            line_top = y - padding
+                            for line in lines[start:end]:
+                                draw_text(x + padding, baseline_in(line_top, size, leading), line, size)
+                                line_top -= leading
+                        y -= row_height
+                        
+                        if end >= row_lines:
+                            break
+                        start = end
+                        flush_page()
+                y -= PDF_FONT_SIZE * 0.5
+        
+        if ops or not page_ids:
+            flush_page()
+        
+        used_gids = {cmap[ord(char)]: char for char in used_chars if ord(char) in cmap}
+        gids = sorted(used_gids)
+        font_file, font_length = subset_pdf_font(font['path'], frozenset(font['base_gids'] | set(gids)))
+        base_font = f"BOTFNT+{font['name']}"
+        
+        write_pdf_object(
+            output, offsets, 3,
+            f"<< /Type /Font /Subtype /Type0 /BaseFont /{base_font} /Encoding /Identity-H "
+            f"/DescendantFonts [4 0 R] /ToUnicode 7 0 R >>"
+        )
+        glyph_widths = " ".join(f"{gid} [{widths[gid]}]" for gid in gids)
+        write_pdf_object(
+            output, offsets, 4,
+            f"<< /Type /Font /Subtype /CIDFontType2 /BaseFont /{base_font} "
+            f"/CIDSystemInfo << /Registry (Adobe) /Ordering (Identity) /Supplement 0 >> "
+            f"/FontDescriptor 5 0 R /CIDToGIDMap /Identity /DW 1000 /W [{glyph_widths}] >>"
+        )
+        bbox = " ".join(str(value) for value in font['bbox'])
+        write_pdf_object(
+            output, offsets, 5,
+            f"<< /Type /FontDescriptor /FontName /{base_font} /Flags 32 /FontBBox [{bbox}] "
+            f"/ItalicAngle 0 /Ascent {font['ascent']} /Descent {font['descent']} "
+            f"/CapHeight {font['cap_height']} /StemV 80 /FontFile2 6 0 R >>"
+        )
+        write_pdf_object(
+            output, offsets, 6,
+            f"<< /Length {len(font_file)} /Length1 {font_length} /Filter /FlateDecode >>",
+            font_file
+        )
+        
+        cmap_lines = [
+            "/CIDInit /ProcSet findresource begin",
+            "12 dict begin",
+            "begincmap",
+            "/CIDSystemInfo << /Registry (Adobe) /Ordering (UCS) /Supplement 0 >> def",
+            "/CMapName /Adobe-Identity-UCS def",
+            "/CMapType 2 def",
+            "1 begincodespacerange",
+            "<0000> <FFFF>",
+            "endcodespacerange",
+        ]
+        for start in range(0, len(gids), 100):
+            chunk = gids[start:start + 100]
+            cmap_lines.append(f"{len(chunk)} beginbfchar")
+            for gid in chunk:
+                cmap_lines.append(f"<{gid:04X}> <{used_gids[gid].encode('utf-16-be').hex().upper()}>")
+            cmap_lines.append("endbfchar")
+        cmap_lines += ["endcmap", "CMapName currentdict /CMap defineresource pop", "end", "end"]
+        to_unicode = "\n".join(cmap_lines).encode('ascii')
+        write_pdf_object(output, offsets, 7, f"<< /Length {len(to_unicode)} >>", to_unicode)
+        
+        write_pdf_trailer(output, offsets, page_ids)
+    
+    return len(page_ids)
+
 async def handle_callback(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     query = update.callback_query
     await query.answer()
@@ -711,6 +1525,18 @@ async def handle_callback(update: Update, context: ContextTypes.DEFAULT_TYPE) ->
             "Iltimos, PDF formatiga o'zgartirmoqchi bo'lgan Word hujjatini (DOCX/DOC) yuklang."
         )
     
+    elif query.data == "images_to_pdf":
+        context.user_data['waiting_for_file'] = 'images_to_pdf'
+        context.user_data['image_file_ids'] = []
+        context.user_data['last_media_group_id'] = None
+        context.user_data['image_limit_notified'] = False
+        await query.message.reply_text(
+            "Iltimos, PDF ga aylantirmoqchi bo'lgan rasmlarni (albom ham bo'ladi) yoki rasmlar joylangan ZIP faylni yuklang."
+        )
+    
+    elif query.data == "images_to_pdf_done":
+        await handle_images_done(update, context)
+    
     elif query.data == "cyrillic_to_latin":
         context.user_data['waiting_for_file'] = 'cyrillic_to_latin'
         await query.message.reply_text(
@@ -723,6 +1549,70 @@ async def handle_callback(update: Update, context: ContextTypes.DEFAULT_TYPE) ->
             "Iltimos, Lotindan Kirilga o'zgartirmoqchi bo'lgan PDF yoki Word faylni yuklang."
         )
 
+async def handle_inline_query(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+    query = update.inline_query.query
+    
+    if not query.strip():
+        await update.inline_query.answer([], cache_time=0)
+        return
+    
+    directions = [
+        ("cyrillic_to_latin", "Kril → Lotin", transliterate_text(query, to_latin=True)),
+        ("latin_to_cyrillic", "Lotin → Kril", transliterate_text(query, to_latin=False)),
+    ]
+    
+    # Telegram rejects empty message text (e.g. a query made only of "ь").
+    results = [
+        InlineQueryResultArticle(
+            id=result_id,
+            title=title,
+            description=result[:100],
+            input_message_content=InputTextMessageContent(result[:TELEGRAM_MESSAGE_LIMIT])
+        )
+        for result_id, title, result in directions
+        if result.strip()
+    ]
+    
+    if detect_script(query) == 'latin':
+        results.reverse()
+    
+    await update.inline_query.answer(results, cache_time=300)
+
+async def profile_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+    if str(update.effective_user.id) != str(ADMIN_ID):
+        return
+    
+    arg = context.args[0].lower() if context.args else str(PROFILE_DEFAULT_JOBS)
+    
+    if arg == 'stop':
+        if profiling['profiler'] is None:
+            await update.message.reply_text("Profil yoqilmagan.")
+        else:
+            await finish_profiling()
+        return
+    
+    if profiling['profiler'] is not None:
+        await update.message.reply_text("Profil allaqachon yoqilgan. To'xtatish uchun: /profile stop")
+        return
+    
+    try:
+        if arg.endswith('s'):
+            seconds = int(arg[:-1])
+            if seconds <= 0:
+                raise ValueError(arg)
+            start_profiling(context.bot, update.effective_chat.id, seconds=seconds)
+            await update.message.reply_text(f"Profil {seconds} soniya davomida yig'ilmoqda.")
+        else:
+            jobs = int(arg)
+            if jobs <= 0:
+                raise ValueError(arg)
+            start_profiling(context.bot, update.effective_chat.id, jobs=jobs)
+            await update.message.reply_text(f"Profil keyingi {jobs} ta vazifa uchun yig'ilmoqda.")
+    except ValueError:
+        await update.message.reply_text(
+            "Foydalanish: /profile [N] — keyingi N ta vazifa, /profile 60s — 60 soniya, /profile stop"
+        )
+
 async def setup_commands(application):
     commands = [
         BotCommand("start", "Botni ishga tushirish"),
@@ -731,17 +1621,33 @@ async def setup_commands(application):
     
     await application.bot.set_my_commands(commands)
 
+async def post_init(application):
+    await setup_commands(application)
+    
+    if LOOP_LAG_THRESHOLD > 0:
+        application.bot_data['loop_lag_task'] = asyncio.get_running_loop().create_task(monitor_loop_lag())
+
+async def post_shutdown(application):
+    loop_lag_stop.set()
+    loop_lag_task = application.bot_data.get('loop_lag_task')
+    if loop_lag_task is not None:
+        loop_lag_task.cancel()
+
 def main() -> None:
     application = Application.builder().token(BOT_TOKEN).build()
 
     application.add_handler(CommandHandler("start", start))
     application.add_handler(CommandHandler("help", help_command))
     application.add_handler(CommandHandler("menu", menu_command))
+    application.add_handler(CommandHandler("profile", profile_command))
     application.add_handler(MessageHandler(filters.TEXT & ~filters.COMMAND, handle_text))
     application.add_handler(MessageHandler(filters.Document.ALL, handle_document))
+    application.add_handler(MessageHandler(filters.PHOTO, handle_photo))
     application.add_handler(CallbackQueryHandler(handle_callback))
+    application.add_handler(InlineQueryHandler(handle_inline_query))
 
-    application.post_init = setup_commands
+    application.post_init = post_init
+    application.post_shutdown = post_shutdown
 
     print("Bot started...")
     application.run_polling()